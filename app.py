@@ -12,6 +12,8 @@ import os
 # Importar módulos personalizados
 from utils.expert_system import SafetyExpertSystem
 from utils.config import CLASS_NAMES, ALERT_LEVELS
+from utils.detection import simulate_detections, scenario_from_filename
+from utils.visualization import draw_detections_on_image
 
 # =============================================
 # CONFIGURACIÓN DE LA PÁGINA
@@ -126,98 +128,6 @@ def create_fallback_image():
                 cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
     return img
 
-def simulate_detections(scenario_type):
-    """
-    Simular detecciones de YOLO basadas en el escenario
-    Returns: lista de detecciones simuladas
-    """
-    if scenario_type == "escenario_seguro":
-        return [
-            {'class_name': 'person', 'confidence': 0.95, 'bbox': [100, 100, 200, 300]},
-            {'class_name': 'helmet', 'confidence': 0.92, 'bbox': [110, 90, 130, 120]},
-            {'class_name': 'safety_vest', 'confidence': 0.89, 'bbox': [100, 100, 200, 150]},
-            {'class_name': 'person', 'confidence': 0.88, 'bbox': [300, 150, 400, 350]},
-            {'class_name': 'helmet', 'confidence': 0.91, 'bbox': [310, 140, 330, 170]},
-            {'class_name': 'safety_vest', 'confidence': 0.87, 'bbox': [300, 150, 400, 200]}
-        ]
-    elif scenario_type == "escenario_alerta":
-        return [
-            {'class_name': 'person', 'confidence': 0.95, 'bbox': [100, 100, 200, 300]},
-            {'class_name': 'helmet', 'confidence': 0.92, 'bbox': [110, 90, 130, 120]},
-            # Falta chaleco para una persona
-            {'class_name': 'person', 'confidence': 0.88, 'bbox': [300, 150, 400, 350]},
-            {'class_name': 'safety_vest', 'confidence': 0.87, 'bbox': [300, 150, 400, 200]}
-            # Falta casco para la segunda persona
-        ]
-    else:  # escenario_critico
-        return [
-            {'class_name': 'person', 'confidence': 0.95, 'bbox': [100, 100, 200, 300]},
-            {'class_name': 'person', 'confidence': 0.88, 'bbox': [300, 150, 400, 350]},
-            # Faltan ambos EPPs para todas las personas
-        ]
-
-def draw_detections_on_image(image, detections, analysis):
-    """
-    Dibujar bounding boxes y información en la imagen
-    Returns: imagen con anotaciones
-    """
-    img_copy = image.copy()
-    
-    # Colores para cada clase
-    colors = {
-        'person': (0, 255, 0),      # Verde - Trabajadores
-        'helmet': (255, 0, 0),      # Azul - Cascos
-        'safety_vest': (0, 0, 255)  # Rojo - Chalecos
-    }
-    
-    # Dibujar cada detección
-    for detection in detections:
-        class_name = detection['class_name']
-        confidence = detection['confidence']
-        x1, y1, x2, y2 = map(int, detection['bbox'])
-        color = colors.get(class_name, (255, 255, 255))
-        
-        # Dibujar bounding box
-        cv2.rectangle(img_copy, (x1, y1), (x2, y2), color, 3)
-        
-        # Etiqueta con clase y confianza
-        label = f"{class_name} ({confidence:.2f})"
-        label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
-        
-        # Fondo para la etiqueta
-        cv2.rectangle(img_copy, (x1, y1 - label_size[1] - 10), 
-                     (x1 + label_size[0], y1), color, -1)
-        # Texto de la etiqueta
-        cv2.putText(img_copy, label, (x1, y1 - 5), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-    
-    # Añadir panel de información del análisis
-    alert_level = analysis['alert_level']
-    alert_color = {
-        'ALTA': (0, 0, 255),    # Rojo
-        'MEDIA': (0, 165, 255), # Naranja
-        'OK': (0, 255, 0)       # Verde
-    }.get(alert_level, (255, 255, 255))
-    
-    # Panel semi-transparente
-    overlay = img_copy.copy()
-    cv2.rectangle(overlay, (10, 10), (500, 130), (0, 0, 0), -1)
-    cv2.addWeighted(overlay, 0.7, img_copy, 0.3, 0, img_copy)
-    
-    # Texto del análisis
-    cv2.putText(img_copy, f"ESTADO: {alert_level}", (20, 40),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.8, alert_color, 2)
-    cv2.putText(img_copy, analysis['alert_message'], (20, 70),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-    
-    # Estadísticas
-    stats = analysis.get('statistics', {})
-    stats_text = f"Trabajadores: {stats.get('persons', 0)} | Cascos: {stats.get('helmets', 0)} | Chalecos: {stats.get('vests', 0)}"
-    cv2.putText(img_copy, stats_text, (20, 100),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-    
-    return img_copy
-
 # =============================================
 # INTERFAZ PRINCIPAL - SIDEBAR
 # =============================================
@@ -357,13 +267,7 @@ with col1:
             
             with st.spinner("🔍 Analizando seguridad en la imagen..."):
                 # Simular detecciones basadas en el nombre del archivo
-                file_name = uploaded_image.name.lower()
-                if "safe" in file_name or "good" in file_name:
-                    user_detections = simulate_detections("escenario_seguro")
-                elif "alert" in file_name or "warning" in file_name:
-                    user_detections = simulate_detections("escenario_alerta")
-                else:
-                    user_detections = simulate_detections("escenario_critico")
+                user_detections = simulate_detections(scenario_from_filename(uploaded_image.name))
                 
                 user_analysis = expert_system.analyze_detections(user_detections)
                 processed_image = draw_detections_on_image(image_array, user_detections, user_analysis)
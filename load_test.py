@@ -0,0 +1,202 @@
+"""
+Prueba de carga del servicio HTTP de SafeBuild
+Envía imágenes sintéticas desde varios clientes concurrentes (cada uno con
+una conexión keep-alive) y reporta throughput y latencias de cola.
+
+Uso:
+    python server.py &
+    python load_test.py --concurrency 16 --duration 20
+    python load_test.py --rate 200 --duration 20       # lazo abierto
+"""
+
+import argparse
+import http.client
+import queue
+import threading
+import time
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+from utils.config import SERVER_CONFIG
+from utils.synthetic import SyntheticSceneGenerator
+
+
+def build_payloads(count, width, height, seed):
+    """Codificar en JPEG un conjunto de escenas sintéticas (una sola vez)"""
+    payloads = []
+    generator = SyntheticSceneGenerator(seed=seed, width=width, height=height, workers=(0, 15))
+    for scene in generator.scenes(count):
+        buffer = BytesIO()
+        Image.fromarray(scene['image']).save(buffer, format='JPEG', quality=90)
+        payloads.append(buffer.getvalue())
+    return payloads
+
+
+def send_request(connection, path, body):
+    """Enviar una solicitud; devuelve (status, conexión_reutilizable, retry_after)"""
+    try:
+        connection.request('POST', path, body=body,
+                           headers={'Content-Type': 'image/jpeg'})
+        response = connection.getresponse()
+        response.read()
+        reusable = response.getheader('Connection', '').lower() != 'close'
+        retry_after = float(response.getheader('Retry-After') or 0)
+        return response.status, reusable, retry_after
+    except (OSError, http.client.HTTPException):
+        return 'error', False, 0
+
+
+def client_worker(host, port, path, payloads, stop_at, max_requests, records, lock,
+                  schedule=None):
+    """
+    Cliente con conexión keep-alive propia
+
+    En modo cerrado (schedule=None) envía una solicitud tras otra. En modo
+    abierto toma instantes programados de schedule y mide la latencia desde
+    ese instante, así la espera por clientes ocupados también cuenta.
+    """
+    connection = http.client.HTTPConnection(host, port, timeout=SERVER_CONFIG['request_timeout'])
+    backoff = 0
+    index = 0
+    while time.monotonic() < stop_at:
+        with lock:
+            if max_requests is not None and len(records) >= max_requests:
+                break
+        if schedule is not None:
+            try:
+                scheduled = schedule.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if scheduled is None:
+                break
+        body = payloads[index % len(payloads)]
+        index += 1
+
+        start = time.perf_counter() if schedule is None else scheduled
+        status, reusable, retry_after = send_request(connection, path, body)
+        latency = time.perf_counter() - start
+        if not reusable:
+            connection.close()
+
+        with lock:
+            records.append((status, latency))
+
+        # Espera creciente tras errores de conexión (p. ej. servidor caído)
+        if status == 'error':
+            backoff = min(max(backoff * 2, 0.05), 1.0)
+            time.sleep(backoff)
+        else:
+            backoff = 0
+            if status == 503 and schedule is None:
+                # Un cliente real respeta Retry-After antes de reintentar
+                time.sleep(retry_after)
+    connection.close()
+
+
+def dispatch_open_loop(rate, stop_at, schedule, workers):
+    """
+    Programar solicitudes a ritmo fijo (carga de lazo abierto)
+
+    Returns:
+        int: Cantidad de solicitudes programadas
+    """
+    interval = 1.0 / rate
+    next_send = time.perf_counter()
+    scheduled = 0
+    while time.monotonic() < stop_at:
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        schedule.put(next_send)
+        scheduled += 1
+        next_send += interval
+    for _ in range(workers):
+        schedule.put(None)
+    return scheduled
+
+
+def count_unsent(schedule):
+    """Solicitudes programadas que ningún cliente llegó a enviar antes del final"""
+    unsent = 0
+    while True:
+        try:
+            if schedule.get_nowait() is not None:
+                unsent += 1
+        except queue.Empty:
+            return unsent
+
+
+def report(records, elapsed, scheduled=None, unsent=0):
+    """
+    Imprimir throughput, latencias y distribución de códigos de respuesta
+
+    En lazo abierto las solicitudes programadas y nunca enviadas (todos los
+    clientes ocupados) se cuentan como fallas 'unsent': omitirlas ocultaría
+    la sobrecarga.
+    """
+    statuses = {}
+    for status, _ in records:
+        statuses[status] = statuses.get(status, 0) + 1
+    if unsent:
+        statuses['unsent'] = unsent
+    ok_latencies = np.array([latency for status, latency in records if status == 200]) * 1000
+
+    if scheduled is not None:
+        print(f"Programadas: {scheduled}, enviadas: {len(records)}, sin enviar: {unsent}")
+    print(f"Solicitudes: {len(records)} en {elapsed:.1f}s")
+    print(f"Respuestas: {statuses}")
+    print(f"Throughput (200 OK): {len(ok_latencies) / elapsed:.1f} req/s")
+    if len(ok_latencies):
+        p50, p95, p99 = np.percentile(ok_latencies, [50, 95, 99])
+        print(f"Latencia (ms): p50={p50:.1f} p95={p95:.1f} p99={p99:.1f} "
+              f"max={ok_latencies.max():.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de SafeBuild")
+    parser.add_argument('--host', default=SERVER_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=SERVER_CONFIG['port'])
+    parser.add_argument('--concurrency', type=int, default=2 * SERVER_CONFIG['max_in_flight'],
+                        help="Clientes concurrentes (por defecto supera la capacidad "
+                             "del servidor para ejercitar el descarte de carga)")
+    parser.add_argument('--rate', type=float,
+                        help="Modo de lazo abierto: solicitudes por segundo programadas")
+    parser.add_argument('--duration', type=float, default=20, help="Duración en segundos")
+    parser.add_argument('--requests', type=int, help="Cortar tras esta cantidad de solicitudes")
+    parser.add_argument('--images', type=int, default=8, help="Imágenes sintéticas distintas")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--annotated', action='store_true', help="Pedir la imagen anotada")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    payloads = build_payloads(args.images, args.width, args.height, args.seed)
+    path = '/analyze' + ('?annotated=1' if args.annotated else '')
+
+    records = []
+    lock = threading.Lock()
+    start = time.monotonic()
+    stop_at = start + args.duration
+    schedule = queue.Queue() if args.rate else None
+    threads = [
+        threading.Thread(target=client_worker,
+                         args=(args.host, args.port, path, payloads, stop_at,
+                               args.requests, records, lock, schedule))
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    scheduled = None
+    if args.rate:
+        scheduled = dispatch_open_loop(args.rate, stop_at, schedule, args.concurrency)
+    for thread in threads:
+        thread.join()
+
+    unsent = count_unsent(schedule) if args.rate else 0
+    report(records, time.monotonic() - start, scheduled, unsent)
+
+
+if __name__ == '__main__':
+    main()
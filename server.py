@@ -0,0 +1,305 @@
+"""
+Servicio HTTP local de inferencia de SafeBuild
+Permite integrar SafeBuild con otros sistemas (p. ej. el VMS de la obra) sin
+pasar por la interfaz de Streamlit.
+
+Endpoints:
+    POST /analyze   Cuerpo: bytes de la imagen (JPG/PNG)
+                    Parámetros: annotated=1, filename=<nombre>, min_confidence=<0-1>
+    GET  /health    Estado del servicio y de la cola
+
+Uso:
+    python server.py --port 8502 --max-batch-size 8 --max-wait-ms 10
+"""
+
+import argparse
+import base64
+import importlib
+import json
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from PIL import Image
+
+from utils.batching import MicroBatcher, QueueFullError
+from utils.config import APP_CONFIG, MODEL_CONFIG, SERVER_CONFIG
+from utils.detection import scenario_from_filename, simulate_detections
+from utils.expert_system import SafetyExpertSystem
+from utils.tiling import should_tile, tiled_inference
+from utils.visualization import draw_detections_on_image
+
+
+# =============================================
+# DETECCIÓN Y ANÁLISIS POR LOTES
+# =============================================
+def simulated_detect_batch(items):
+    """
+    Detector por lotes por defecto: detecciones simuladas según el nombre de archivo
+    Mismo criterio que el modo "Subir Mi Propia Imagen" de app.py
+    """
+    return [simulate_detections(scenario_from_filename(item['filename'])) for item in items]
+
+
+def load_detector(spec):
+    """
+    Cargar un detector por lotes desde 'modulo:funcion'
+    La función recibe la lista de items ({image, filename}) y devuelve una
+    lista de detecciones por item
+    """
+    module_name, _, function_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def make_batch_processor(detect_batch, expert_system, tiled=True):
+    """
+    Crear la función que procesa un micro-lote: detector + sistema experto
+
+    Las imágenes grandes (fotos de dron o grúa, ver should_tile) se procesan
+    por teselas: cada tesela se pasa al detector por lotes como un item más.
+    """
+    def detect_tiles(item):
+        def detect_tile_batch(tiles):
+            return detect_batch([{**item, 'image': tile} for tile in tiles])
+        return tiled_inference(item['image'], detect_tile_batch,
+                               confidence_threshold=item['min_confidence'])
+
+    def process_batch(items):
+        large = [tiled and should_tile(item['image']) for item in items]
+        whole_items = [item for item, is_large in zip(items, large) if not is_large]
+        whole_detections = iter(detect_batch(whole_items) if whole_items else [])
+
+        results = []
+        for item, is_large in zip(items, large):
+            tile_stats = None
+            if is_large:
+                tiled_result = detect_tiles(item)
+                detections, tile_stats = tiled_result['detections'], tiled_result['tiles']
+            else:
+                detections = next(whole_detections)
+
+            detections = [det for det in detections
+                          if det['confidence'] >= item['min_confidence']]
+            analysis = expert_system.analyze_detections(detections)
+            result = {**analysis, 'detections': detections}
+            if tile_stats is not None:
+                result['tiles'] = tile_stats
+            results.append(result)
+        return results
+    return process_batch
+
+
+# =============================================
+# SERVIDOR HTTP
+# =============================================
+class InferenceRequestHandler(BaseHTTPRequestHandler):
+    """Manejador HTTP/1.1 (keep-alive) de las solicitudes de análisis"""
+
+    protocol_version = 'HTTP/1.1'
+    # Enviar cabeceras y cuerpo sin esperar el ACK retrasado (keep-alive)
+    disable_nagle_algorithm = True
+    server_version = 'SafeBuild/' + APP_CONFIG['version']
+    timeout = SERVER_CONFIG['keepalive_timeout']
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False, default=float).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message, headers=None):
+        self._send_json(status, {'error': message}, headers)
+
+    def do_GET(self):
+        if urlparse(self.path).path != '/health':
+            self._send_error(404, "Ruta no encontrada")
+            return
+        batcher = self.server.batcher
+        self._send_json(200, {
+            'status': 'ok',
+            'queue_size': batcher.pending(),
+            **batcher.stats
+        })
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/analyze':
+            self._send_error(404, "Ruta no encontrada")
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            self._send_error(400, "Content-Length inválido", headers={'Connection': 'close'})
+            return
+        # Sin un Content-Length válido el cuerpo queda sin leer (p. ej. chunked):
+        # se cierra la conexión para no interpretarlo como la siguiente solicitud
+        if length <= 0:
+            self._send_error(400, "Se requiere el cuerpo con la imagen (Content-Length)",
+                             headers={'Connection': 'close'})
+            return
+        if length > SERVER_CONFIG['max_body_bytes']:
+            self._send_error(413, "Imagen demasiado grande", headers={'Connection': 'close'})
+            return
+
+        # Admisión antes de decodificar (y de leer imágenes grandes): si el
+        # servicio está saturado se rechaza de inmediato
+        if not self.server.admission.acquire(blocking=False):
+            self.server.batcher.record_rejected()
+            self._reject_overloaded(length)
+            return
+        try:
+            self._analyze(url, length)
+        finally:
+            self.server.admission.release()
+
+    def _reject_overloaded(self, length):
+        """
+        Responder 503 sin procesar la imagen
+
+        Los cuerpos chicos se descartan para conservar la conexión keep-alive
+        (reconectar bajo carga cuesta más que leerlos); los grandes no se leen
+        y se cierra la conexión.
+        """
+        headers = {'Retry-After': '1'}
+        if length <= SERVER_CONFIG['max_drain_bytes']:
+            self.rfile.read(length)
+        else:
+            headers['Connection'] = 'close'
+        self._send_error(503, "Servicio saturado, reintente más tarde", headers=headers)
+
+    def _analyze(self, url, length):
+        body = self.rfile.read(length)
+
+        query = parse_qs(url.query)
+        annotated = query.get('annotated', ['0'])[0].lower() in ('1', 'true', 'yes')
+        filename = query.get('filename', [self.headers.get('X-Filename', '')])[0]
+        try:
+            min_confidence = float(query.get('min_confidence',
+                                             [MODEL_CONFIG['confidence_threshold']])[0])
+            # nan o valores fuera de rango filtrarían todo y se informaría "OK"
+            if not 0 <= min_confidence <= 1:
+                raise ValueError("min_confidence debe estar entre 0 y 1")
+            image = np.array(Image.open(BytesIO(body)).convert('RGB'))
+        except Image.DecompressionBombError:
+            self._send_error(413, "Imagen con demasiados píxeles")
+            return
+        except (ValueError, OSError) as error:
+            self._send_error(400, f"Solicitud inválida: {error}")
+            return
+
+        try:
+            future = self.server.batcher.submit({
+                'image': image,
+                'filename': filename,
+                'min_confidence': min_confidence
+            })
+        except QueueFullError:
+            self._send_error(503, "Servicio saturado, reintente más tarde",
+                             headers={'Retry-After': '1'})
+            return
+
+        try:
+            result = future.result(timeout=SERVER_CONFIG['request_timeout'])
+        except FutureTimeoutError:
+            future.cancel()
+            self._send_error(504, "Tiempo de espera agotado")
+            return
+        except Exception as error:
+            self._send_error(500, f"Error en el análisis: {error}")
+            return
+
+        if annotated:
+            # Se dibuja en el hilo de la conexión para no frenar el micro-lote
+            annotated_image = draw_detections_on_image(image, result['detections'], result)
+            buffer = BytesIO()
+            Image.fromarray(annotated_image).save(buffer, format='JPEG', quality=85)
+            result['annotated_image'] = base64.b64encode(buffer.getvalue()).decode('ascii')
+
+        self._send_json(200, result)
+
+
+class InferenceServer(ThreadingHTTPServer):
+    """Servidor con un hilo por conexión y un micro-lote compartido"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, batcher, max_in_flight=None, verbose=False):
+        super().__init__(address, InferenceRequestHandler)
+        self.batcher = batcher
+        self.admission = threading.BoundedSemaphore(
+            max_in_flight or SERVER_CONFIG['max_in_flight'])
+        self.verbose = verbose
+
+
+def create_server(host=None, port=None, detect_batch=simulated_detect_batch,
+                  max_batch_size=None, max_wait_ms=None, max_queue_size=None,
+                  max_in_flight=None, tiled=None, verbose=False):
+    """
+    Crear el servidor con su micro-lote ya iniciado
+
+    Si tiled es None, las imágenes grandes se procesan por teselas salvo con el
+    detector simulado, que devuelve escenarios fijos y no tiene sentido por tesela.
+
+    Returns:
+        InferenceServer: Listo para serve_forever()
+    """
+    if tiled is None:
+        tiled = detect_batch is not simulated_detect_batch
+    batcher = MicroBatcher(
+        make_batch_processor(detect_batch, SafetyExpertSystem(), tiled=tiled),
+        max_batch_size=max_batch_size,
+        max_wait_ms=max_wait_ms,
+        max_queue_size=max_queue_size
+    ).start()
+    address = (host or SERVER_CONFIG['host'], SERVER_CONFIG['port'] if port is None else port)
+    return InferenceServer(address, batcher, max_in_flight=max_in_flight, verbose=verbose)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP de inferencia de SafeBuild")
+    parser.add_argument('--host', default=SERVER_CONFIG['host'])
+    parser.add_argument('--port', type=int, default=SERVER_CONFIG['port'])
+    parser.add_argument('--max-batch-size', type=int, default=SERVER_CONFIG['max_batch_size'])
+    parser.add_argument('--max-wait-ms', type=float, default=SERVER_CONFIG['max_wait_ms'])
+    parser.add_argument('--max-queue-size', type=int, default=SERVER_CONFIG['max_queue_size'])
+    parser.add_argument('--max-in-flight', type=int, default=SERVER_CONFIG['max_in_flight'])
+    parser.add_argument('--detector', help="Detector por lotes como 'modulo:funcion'")
+    parser.add_argument('--no-tiling', action='store_true',
+                        help="No procesar por teselas las imágenes grandes")
+    parser.add_argument('--verbose', action='store_true', help="Registrar cada solicitud")
+    args = parser.parse_args(argv)
+
+    detect_batch = load_detector(args.detector) if args.detector else simulated_detect_batch
+    server = create_server(args.host, args.port, detect_batch,
+                           max_batch_size=args.max_batch_size,
+                           max_wait_ms=args.max_wait_ms,
+                           max_queue_size=args.max_queue_size,
+                           max_in_flight=args.max_in_flight,
+                           tiled=False if args.no_tiling else None,
+                           verbose=args.verbose)
+
+    print(f"{APP_CONFIG['name']} escuchando en http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.stop()
+
+
+if __name__ == '__main__':
+    main()
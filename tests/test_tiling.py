@@ -0,0 +1,108 @@
+"""
+Pruebas de la inferencia por teselas con un detector oráculo (ground truth
+recortado a cada tesela) sobre escenas del generador sintético
+"""
+
+import numpy as np
+import pytest
+
+from utils.expert_system import SafetyExpertSystem
+from utils.synthetic import SyntheticSceneGenerator
+from utils.tiling import iter_tiles, is_empty_tile, non_max_suppression, tiled_inference
+
+
+def oracle_detector(image, ground_truth):
+    """Detector por lotes que devuelve el ground truth visible en cada tesela (skip_empty=False)"""
+    positions = ((x, y) for x, y, _ in iter_tiles(image))
+
+    def detect_batch(tiles):
+        results = []
+        for tile in tiles:
+            x, y = next(positions)
+            tile_h, tile_w = tile.shape[:2]
+            detections = []
+            for det in ground_truth:
+                x1, y1, x2, y2 = det['bbox']
+                x1, y1 = max(x1, x), max(y1, y)
+                x2, y2 = min(x2, x + tile_w), min(y2, y + tile_h)
+                if x2 - x1 >= 2 and y2 - y1 >= 2:
+                    detections.append({**det, 'bbox': [x1 - x, y1 - y, x2 - x, y2 - y]})
+            results.append(detections)
+        return results
+    return detect_batch
+
+
+def run_oracle(image, ground_truth):
+    detect_batch = oracle_detector(image, ground_truth)
+    return tiled_inference(image, detect_batch, skip_empty=False)['detections']
+
+
+def count(detections, class_name='person'):
+    return sum(1 for det in detections if det['class_name'] == class_name)
+
+
+@pytest.fixture
+def large_image():
+    return np.full((3000, 4000, 3), 150, dtype=np.uint8)
+
+
+def test_worker_in_last_row_keeps_complete_box(large_image):
+    # La última fila de teselas (y=2360) se solapa 328 px con la anterior,
+    # no tile_size * overlap: la caja completa está a 300 px de la costura
+    ground_truth = [
+        {'class_name': 'person', 'confidence': 0.9, 'bbox': [300, 2660, 360, 2860]},
+        {'class_name': 'helmet', 'confidence': 0.9, 'bbox': [315, 2660, 345, 2684]},
+        {'class_name': 'safety_vest', 'confidence': 0.9, 'bbox': [300, 2700, 360, 2760]},
+    ]
+    detections = run_oracle(large_image, ground_truth)
+
+    persons = [det for det in detections if det['class_name'] == 'person']
+    assert [det['bbox'] for det in persons] == [[300, 2660, 360, 2860]]
+    assert SafetyExpertSystem().analyze_detections(detections)['alert_level'] == 'OK'
+
+
+def test_fragment_does_not_suppress_complete_box(large_image):
+    ground_truth = [{'class_name': 'person', 'confidence': 0.9, 'bbox': [300, 2600, 360, 2760]}]
+    detections = run_oracle(large_image, ground_truth)
+
+    assert [det['bbox'] for det in detections] == [[300, 2600, 360, 2760]]
+
+
+@pytest.mark.parametrize('clustering', [0.0, 0.2, 0.5])
+def test_person_count_matches_whole_image_nms(clustering):
+    generator = SyntheticSceneGenerator(seed=5, width=4000, height=3000, workers=(5, 40),
+                                        overlap=clustering, worker_height=(0.03, 0.1))
+    for scene in generator.scenes(6):
+        rng = np.random.default_rng(scene['frame_index'])
+        ground_truth = [dict(det, confidence=float(rng.uniform(0.6, 1.0)))
+                        for det in scene['detections']]
+        detections = run_oracle(scene['image'], ground_truth)
+
+        assert count(detections) == count(non_max_suppression(ground_truth))
+
+
+@pytest.mark.parametrize('color, background', [
+    ((102, 200, 117), 138),
+    ((191, 163, 122), 170),
+])
+def test_colored_worker_on_equal_brightness_is_not_empty(color, background):
+    rng = np.random.default_rng(0)
+    tile = np.clip(rng.normal(background, 2, size=(640, 640, 3)), 0, 255).astype(np.uint8)
+    assert is_empty_tile(tile)
+
+    tile[300:330, 300:312] = color
+    assert not is_empty_tile(tile)
+
+
+def test_generator_tiles_with_workers_are_not_skipped():
+    generator = SyntheticSceneGenerator(seed=1, width=4000, height=3000, workers=(5, 30),
+                                        helmet_ratio=0, vest_ratio=0,
+                                        worker_height=(0.015, 0.04))
+    for scene in generator.scenes(5):
+        boxes = [det['bbox'] for det in scene['detections']]
+        for x, y, tile in iter_tiles(scene['image']):
+            tile_h, tile_w = tile.shape[:2]
+            has_worker = any(x1 >= x and y1 >= y and x2 <= x + tile_w and y2 <= y + tile_h
+                             for x1, y1, x2, y2 in boxes)
+            if has_worker:
+                assert not is_empty_tile(tile)
@@ -10,10 +10,17 @@ __description__ = "Módulos auxiliares para el sistema de monitoreo de seguridad
 # Importaciones para facilitar el acceso
 from .expert_system import SafetyExpertSystem
 from .config import CLASS_NAMES, ALERT_LEVELS, SAFETY_RULES
+from .tiling import tiled_inference, non_max_suppression
+from .synthetic import SyntheticSceneGenerator
+from .batching import MicroBatcher
 
 __all__ = [
     'SafetyExpertSystem',
     'CLASS_NAMES', 
     'ALERT_LEVELS',
-    'SAFETY_RULES'
+    'SAFETY_RULES',
+    'tiled_inference',
+    'non_max_suppression',
+    'SyntheticSceneGenerator',
+    'MicroBatcher'
 ]
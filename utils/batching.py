@@ -0,0 +1,125 @@
+"""
+Micro-lotes dinámicos para inferencia concurrente
+Agrupa solicitudes concurrentes en lotes (tamaño máximo / espera máxima)
+antes de pasarlas al detector y al sistema experto
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from .config import SERVER_CONFIG
+
+
+class QueueFullError(Exception):
+    """La cola de solicitudes está llena; la solicitud debe rechazarse"""
+
+
+class MicroBatcher:
+    """
+    Agrupador de solicitudes en micro-lotes
+
+    Un único hilo trabajador toma la primera solicitud disponible y espera a
+    lo sumo max_wait_ms por más solicitudes, hasta max_batch_size, antes de
+    procesar el lote. La cola está acotada: cuando se llena, submit() lanza
+    QueueFullError en lugar de bloquear (descarte de carga).
+    """
+
+    def __init__(self, process_batch, max_batch_size=None, max_wait_ms=None,
+                 max_queue_size=None):
+        """
+        Args:
+            process_batch (callable): Función lista_de_items -> lista_de_resultados
+            max_batch_size (int): Tamaño máximo del lote
+            max_wait_ms (float): Espera máxima para completar un lote
+            max_queue_size (int): Capacidad de la cola de solicitudes
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size or SERVER_CONFIG['max_batch_size']
+        if max_wait_ms is None:
+            max_wait_ms = SERVER_CONFIG['max_wait_ms']
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue(maxsize=max_queue_size or SERVER_CONFIG['max_queue_size'])
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self.stats = {'batches': 0, 'items': 0, 'rejected': 0}
+        self._stats_lock = threading.Lock()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self._thread.join(timeout)
+
+    def pending(self):
+        """Cantidad aproximada de solicitudes en cola"""
+        return self._queue.qsize()
+
+    def record_rejected(self):
+        """Contabilizar una solicitud rechazada (también las rechazadas antes de encolar)"""
+        with self._stats_lock:
+            self.stats['rejected'] += 1
+
+    def submit(self, item):
+        """
+        Encolar una solicitud
+
+        Returns:
+            Future: Se completa con el resultado del item
+        Raises:
+            QueueFullError: Si la cola está llena
+        """
+        future = Future()
+        try:
+            self._queue.put_nowait((item, future))
+        except queue.Full:
+            self.record_rejected()
+            raise QueueFullError("Cola de solicitudes llena") from None
+        return future
+
+    def _collect_batch(self):
+        """Esperar la primera solicitud y completar el lote hasta el plazo"""
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            batch = self._collect_batch()
+            # Descartar solicitudes cuyo cliente ya abandonó la espera
+            batch = [(item, future) for item, future in batch
+                     if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            with self._stats_lock:
+                self.stats['batches'] += 1
+                self.stats['items'] += len(batch)
+            try:
+                results = list(self.process_batch([item for item, _ in batch]))
+                if len(results) != len(batch):
+                    raise RuntimeError(f"El lote devolvió {len(results)} resultados "
+                                       f"para {len(batch)} solicitudes")
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -62,6 +62,54 @@ MODEL_CONFIG = {
     'max_detections': 50
 }
 
+# =============================================
+# INFERENCIA POR TESELAS (IMÁGENES DE ALTA RESOLUCIÓN)
+# =============================================
+TILING_CONFIG = {
+    'tile_size': MODEL_CONFIG['image_size'],  # Lado de cada tesela en píxeles
+    'overlap': 0.2,                # Fracción de solapamiento entre teselas vecinas
+    'batch_size': 8,               # Teselas por lote enviado al detector
+    'min_image_side': 1280,        # Por debajo de este lado no se tesela
+    'saliency_threshold': 6.0,     # Desvío estándar mínimo (por celda y canal) de una tesela no vacía
+    'motion_threshold': 10.0,      # Diferencia media mínima (por celda y canal) respecto al frame anterior
+    'saliency_stride': 4,          # Submuestreo usado por el chequeo rápido
+    'merge_metric': 'iou'          # Fusión en costuras: 'iou' o 'ios' (intersección sobre la caja menor)
+}
+
+# =============================================
+# BARRIDO DE PARÁMETROS (PRECISIÓN VS. RENDIMIENTO)
+# =============================================
+SWEEP_CONFIG = {
+    'param_grid': {
+        'confidence_threshold': [0.4, 0.5, 0.6, 0.7],
+        'iou_threshold': [0.45, 0.6],
+        'image_size': [320, 480, 640],
+        'max_detections': [50, 100],
+        'min_confidence': [0.3, 0.6] # Filtro del sidebar aplicado tras el detector
+    },
+    'recall_target': 0.95,           # Recall mínimo de alertas (ALTA/MEDIA) exigido
+    'precision_target': 0.5,         # Precisión mínima de alertas (descarta configuraciones que alarman siempre)
+    'num_scenes': 60,                # Escenas sintéticas por configuración
+    'workers_per_scene': (0, 12),
+    'compliance_ratio': 0.95         # Fracción de trabajadores con casco y chaleco
+}
+
+# =============================================
+# SERVICIO HTTP DE INFERENCIA
+# =============================================
+SERVER_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8502,
+    'max_batch_size': 8,             # Imágenes por micro-lote
+    'max_wait_ms': 10,               # Espera máxima para completar un micro-lote
+    'max_queue_size': 64,            # Solicitudes en cola antes de rechazar (HTTP 503)
+    'max_in_flight': 16,             # Solicitudes admitidas a la vez (decodificación + cola + proceso)
+    'request_timeout': 30,           # Segundos máximos esperando el resultado
+    'keepalive_timeout': 15,         # Segundos de inactividad antes de cerrar la conexión
+    'max_body_bytes': 50 * 1024 * 1024,
+    'max_drain_bytes': 2 * 1024 * 1024  # Cuerpos rechazados (503) que se leen para mantener la conexión
+}
+
 # =============================================
 # COLORES PARA VISUALIZACIÓN
 # =============================================
@@ -0,0 +1,49 @@
+"""
+Detecciones simuladas de SafeBuild
+Mientras no se integre un modelo YOLO real, las detecciones se simulan por
+escenario; este módulo es compartido por la app de Streamlit y el servicio HTTP
+"""
+
+
+def simulate_detections(scenario_type):
+    """
+    Simular detecciones de YOLO basadas en el escenario
+    Returns: lista de detecciones simuladas
+    """
+    if scenario_type == "escenario_seguro":
+        return [
+            {'class_name': 'person', 'confidence': 0.95, 'bbox': [100, 100, 200, 300]},
+            {'class_name': 'helmet', 'confidence': 0.92, 'bbox': [110, 90, 130, 120]},
+            {'class_name': 'safety_vest', 'confidence': 0.89, 'bbox': [100, 100, 200, 150]},
+            {'class_name': 'person', 'confidence': 0.88, 'bbox': [300, 150, 400, 350]},
+            {'class_name': 'helmet', 'confidence': 0.91, 'bbox': [310, 140, 330, 170]},
+            {'class_name': 'safety_vest', 'confidence': 0.87, 'bbox': [300, 150, 400, 200]}
+        ]
+    elif scenario_type == "escenario_alerta":
+        return [
+            {'class_name': 'person', 'confidence': 0.95, 'bbox': [100, 100, 200, 300]},
+            {'class_name': 'helmet', 'confidence': 0.92, 'bbox': [110, 90, 130, 120]},
+            # Falta chaleco para una persona
+            {'class_name': 'person', 'confidence': 0.88, 'bbox': [300, 150, 400, 350]},
+            {'class_name': 'safety_vest', 'confidence': 0.87, 'bbox': [300, 150, 400, 200]}
+            # Falta casco para la segunda persona
+        ]
+    else:  # escenario_critico
+        return [
+            {'class_name': 'person', 'confidence': 0.95, 'bbox': [100, 100, 200, 300]},
+            {'class_name': 'person', 'confidence': 0.88, 'bbox': [300, 150, 400, 350]},
+            # Faltan ambos EPPs para todas las personas
+        ]
+
+
+def scenario_from_filename(file_name):
+    """
+    Elegir el escenario simulado a partir del nombre del archivo subido
+    Returns: clave del escenario para simulate_detections
+    """
+    file_name = (file_name or "").lower()
+    if "safe" in file_name or "good" in file_name:
+        return "escenario_seguro"
+    elif "alert" in file_name or "warning" in file_name:
+        return "escenario_alerta"
+    return "escenario_critico"
@@ -18,7 +18,7 @@ class SafetyExpertSystem:
             # REGLA 2: Algunos trabajadores sin casco
             'no_helmet_partial': {
                 'condition': lambda stats: stats['persons'] > 0 and stats['helmets'] < stats['persons'],
-                'message': f"ALTA: {stats['persons'] - stats['helmets']} trabajador(es) sin casco detectado(s)",
+                'message': "ALTA: {missing_helmets} trabajador(es) sin casco detectado(s)",
                 'level': "ALTA", 
                 'action': "Aislar el área y proveer EPP inmediatamente. Notificar al jefe de cuadrilla"
             },
@@ -34,7 +34,7 @@ class SafetyExpertSystem:
             # REGLA 4: Algunos trabajadores sin chaleco  
             'no_vest_partial': {
                 'condition': lambda stats: stats['persons'] > 0 and stats['vests'] < stats['persons'],
-                'message': f"MEDIA: {stats['persons'] - stats['vests']} trabajador(es) sin chaleco detectado(s)",
+                'message': "MEDIA: {missing_vests} trabajador(es) sin chaleco detectado(s)",
                 'level': "MEDIA",
                 'action': "Recordar uso obligatorio de chaleco en reunión de seguridad. Monitoreo continuo"
             },
@@ -84,12 +84,14 @@ class SafetyExpertSystem:
             if rule['condition'](detection_stats):
                 # Formatear mensaje dinámico si es necesario
                 formatted_message = rule['message']
-                if 'stats' in rule['message']:
+                if '{' in rule['message']:
                     # Reemplazar placeholder con valores reales
                     formatted_message = rule['message'].format(
                         persons=detection_stats['persons'],
                         helmets=detection_stats['helmets'], 
-                        vests=detection_stats['vests']
+                        vests=detection_stats['vests'],
+                        missing_helmets=detection_stats['persons'] - detection_stats['helmets'],
+                        missing_vests=detection_stats['persons'] - detection_stats['vests']
                     )
                 
                 # Retornar análisis completo
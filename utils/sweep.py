@@ -0,0 +1,333 @@
+"""
+Barrido de parámetros: precisión de alertas vs. rendimiento
+Ejecuta conjuntos etiquetados a través del detector y del sistema experto
+bajo una grilla de configuraciones y calcula la frontera de Pareto
+
+Uso:
+    python -m utils.sweep --scenes 60 --processes 4 --recall-target 0.95
+    python -m utils.sweep --dataset mi_obra.datos:muestras --detector mi_obra.modelo:detectar
+"""
+
+import argparse
+import importlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from .config import ALERT_LEVELS, MODEL_CONFIG, SWEEP_CONFIG
+from .expert_system import SafetyExpertSystem
+from .synthetic import SyntheticSceneGenerator
+from .tiling import non_max_suppression
+
+
+# =============================================
+# GRILLA DE PARÁMETROS
+# =============================================
+def expand_grid(param_grid):
+    """
+    Expandir una grilla {parámetro: [valores]} en la lista de configuraciones
+
+    Los parámetros de MODEL_CONFIG que no estén en la grilla toman su valor
+    por defecto, de modo que cada configuración queda completa.
+    """
+    defaults = dict(MODEL_CONFIG, min_confidence=MODEL_CONFIG['confidence_threshold'])
+    keys = list(param_grid)
+    settings = []
+    for values in itertools.product(*(param_grid[key] for key in keys)):
+        settings.append(dict(defaults, **dict(zip(keys, values))))
+    return settings
+
+
+# =============================================
+# DETECTOR SIMULADO
+# =============================================
+def simulated_detector(sample, params):
+    """
+    Detector simulado a partir del ground truth de la muestra
+
+    No hay un modelo real en el repositorio, así que se degrada el ground
+    truth de forma reproducible según los parámetros: los objetos de menos
+    de 8 px a la resolución del modelo (image_size) pierden confianza,
+    algunos objetos generan cajas duplicadas (que la NMS debe eliminar según
+    iou_threshold) y aparecen falsos positivos de baja confianza. Sus tiempos no representan los de
+    un modelo real: fps y latencias sólo tienen sentido con un detector real.
+
+    Args:
+        sample (dict): Muestra con image y detections (ground truth)
+        params (dict): Configuración del modelo
+
+    Returns:
+        list: Detecciones con class_name, confidence, bbox
+    """
+    image = sample.get('image')
+    image_size = params['image_size']
+    height, width = image.shape[:2] if image is not None else (720, 1280)
+    scale = image_size / max(height, width)
+
+    # Misma semilla para todas las configuraciones: sólo cambian los parámetros
+    rng = np.random.default_rng(sample.get('frame_index', 0))
+    raw = []
+    for det in sample['detections']:
+        x1, y1, x2, y2 = det['bbox']
+        apparent = (y2 - y1) * scale
+        base = rng.uniform(0.55, 1.0)
+        visibility = 0.8 if det.get('occluded') else 1.0
+        confidence = base * visibility * min(1.0, apparent / 8.0)
+        raw.append({'class_name': det['class_name'], 'confidence': confidence,
+                    'bbox': [x1, y1, x2, y2]})
+
+        if rng.random() < 0.3:
+            shift = (x2 - x1) * rng.uniform(0.1, 0.35)
+            raw.append({'class_name': det['class_name'], 'confidence': confidence * 0.9,
+                        'bbox': [x1 + shift, y1, x2 + shift, y2]})
+
+    for _ in range(rng.poisson(1.0)):
+        x, y = rng.uniform(0, width), rng.uniform(0, height)
+        raw.append({'class_name': rng.choice(['person', 'helmet', 'safety_vest']),
+                    'confidence': rng.uniform(0.2, 0.7),
+                    'bbox': [x, y, x + 40, y + 80]})
+
+    detections = [det for det in raw if det['confidence'] >= params['confidence_threshold']]
+    detections = non_max_suppression(detections, params['iou_threshold'])
+    return detections[:params['max_detections']]
+
+
+def synthetic_dataset(seed=0, count=None, workers=None, **kwargs):
+    """Conjunto etiquetado sintético (escenas independientes) para el barrido"""
+    generator = SyntheticSceneGenerator(
+        seed=seed,
+        workers=SWEEP_CONFIG['workers_per_scene'] if workers is None else workers,
+        **dict({'helmet_ratio': SWEEP_CONFIG['compliance_ratio'],
+                'vest_ratio': SWEEP_CONFIG['compliance_ratio']}, **kwargs)
+    )
+    return generator.scenes(SWEEP_CONFIG['num_scenes'] if count is None else count)
+
+
+# =============================================
+# EVALUACIÓN
+# =============================================
+def _precision_recall(pairs, level):
+    true_positive = sum(1 for truth, pred in pairs if truth == level and pred == level)
+    predicted = sum(1 for _, pred in pairs if pred == level)
+    actual = sum(1 for truth, _ in pairs if truth == level)
+    return {
+        'precision': true_positive / predicted if predicted else None,
+        'recall': true_positive / actual if actual else None
+    }
+
+
+def alert_metrics(pairs):
+    """
+    Métricas de alertas a partir de pares (nivel real, nivel predicho)
+
+    Además de precisión/recall por nivel se calcula el recall de seguridad:
+    la fracción de muestras con alerta real (ALTA o MEDIA) cuya predicción
+    es al menos igual de severa. Es la métrica que no debe degradarse.
+    """
+    priority = {level: info['priority'] for level, info in ALERT_LEVELS.items()}
+    ok_priority = priority['OK']
+
+    alerts = [(truth, pred) for truth, pred in pairs if priority[truth] < ok_priority]
+    caught = sum(1 for truth, pred in alerts if priority[pred] <= priority[truth])
+    raised = [(truth, pred) for truth, pred in pairs if priority[pred] < ok_priority]
+    justified = sum(1 for truth, _ in raised if priority[truth] < ok_priority)
+
+    return {
+        'per_level': {level: _precision_recall(pairs, level) for level in ALERT_LEVELS},
+        'safety_recall': caught / len(alerts) if alerts else None,
+        'safety_precision': justified / len(raised) if raised else None,
+        'accuracy': sum(1 for truth, pred in pairs if truth == pred) / len(pairs) if pairs else None
+    }
+
+
+def evaluate_setting(params, dataset_factory, detector=simulated_detector):
+    """
+    Evaluar una configuración sobre el conjunto etiquetado
+
+    Sólo se mide el tiempo de detección + filtrado + sistema experto; la
+    generación o lectura de las muestras queda fuera de la medición.
+
+    Args:
+        params (dict): Configuración a evaluar
+        dataset_factory (callable): Devuelve un iterable de muestras {image, detections}
+        detector (callable): Función (muestra, params) -> detecciones
+
+    Returns:
+        dict: params, métricas de alertas, fps y latencias
+    """
+    expert_system = SafetyExpertSystem()
+    pairs = []
+    latencies = []
+
+    for sample in dataset_factory():
+        truth = expert_system.analyze_detections(sample['detections'])['alert_level']
+
+        start = time.perf_counter()
+        detections = detector(sample, params)
+        detections = [det for det in detections
+                      if det['confidence'] >= params['min_confidence']]
+        predicted = expert_system.analyze_detections(detections)['alert_level']
+        latencies.append(time.perf_counter() - start)
+
+        pairs.append((truth, predicted))
+
+    total_time = sum(latencies)
+    return {
+        'params': params,
+        'samples': len(pairs),
+        **alert_metrics(pairs),
+        'fps': len(latencies) / total_time if total_time else None,
+        'latency_p50_ms': float(np.percentile(latencies, 50) * 1000) if latencies else None,
+        'latency_p99_ms': float(np.percentile(latencies, 99) * 1000) if latencies else None
+    }
+
+
+def run_sweep(dataset_factory, param_grid=None, detector=simulated_detector, processes=None):
+    """
+    Evaluar todas las configuraciones de la grilla en paralelo (un proceso por tarea)
+
+    dataset_factory y detector deben poder serializarse (funciones de módulo
+    o functools.partial sobre ellas), ya que se envían a otros procesos.
+    Cada proceso recorre el conjunto de forma perezosa, sin copiarlo entero.
+
+    Returns:
+        list: Resultados de evaluate_setting, en el orden de la grilla
+    """
+    settings = expand_grid(param_grid or SWEEP_CONFIG['param_grid'])
+    task = partial(evaluate_setting, dataset_factory=dataset_factory, detector=detector)
+
+    if processes == 1:
+        return [task(params) for params in settings]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(task, settings))
+
+
+# =============================================
+# FRONTERA DE PARETO Y SELECCIÓN
+# =============================================
+def pareto_frontier(results, objectives=('safety_recall', 'safety_precision', 'fps')):
+    """
+    Configuraciones no dominadas (maximizando todos los objetivos)
+
+    Returns:
+        list: Resultados en la frontera, ordenados por fps descendente
+    """
+    def values(result):
+        return [result[key] if result[key] is not None else float('-inf')
+                for key in objectives]
+
+    frontier = []
+    for candidate in results:
+        candidate_values = values(candidate)
+        dominated = any(
+            all(o >= c for o, c in zip(values(other), candidate_values)) and
+            any(o > c for o, c in zip(values(other), candidate_values))
+            for other in results if other is not candidate
+        )
+        if not dominated:
+            frontier.append(candidate)
+
+    frontier.sort(key=lambda result: result['fps'] or 0, reverse=True)
+    return frontier
+
+
+def select_configuration(results, recall_target=None, precision_target=None):
+    """
+    Configuración más rápida que alcanza el recall de seguridad objetivo (o None)
+
+    También se exige una precisión de seguridad mínima: una configuración que
+    alarma en casi todos los frames alcanza recall 1.0 sin servir de nada. A
+    igual fps se prefiere la de mayor precisión.
+    """
+    if recall_target is None:
+        recall_target = SWEEP_CONFIG['recall_target']
+    if precision_target is None:
+        precision_target = SWEEP_CONFIG['precision_target']
+    eligible = [result for result in results
+                if result['safety_recall'] is not None and result['safety_recall'] >= recall_target
+                and result['safety_precision'] is not None
+                and result['safety_precision'] >= precision_target]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda result: (result['fps'] or 0, result['safety_precision']))
+
+
+def _format_value(value, spec):
+    return 'None' if value is None else format(value, spec)
+
+
+def _format_row(result):
+    params = result['params']
+    return (f"conf={params['confidence_threshold']:.2f} iou={params['iou_threshold']:.2f} "
+            f"size={params['image_size']:4d} max={params['max_detections']:3d} "
+            f"min_conf={params['min_confidence']:.2f} | "
+            f"recall={_format_value(result['safety_recall'], '.3f')} "
+            f"precision={_format_value(result['safety_precision'], '.3f')} "
+            f"fps={_format_value(result['fps'], '.1f')} "
+            f"p99_ms={_format_value(result['latency_p99_ms'], '.2f')}")
+
+
+def _load_callable(spec):
+    """Cargar una función desde 'modulo:funcion'"""
+    module_name, _, function_name = spec.partition(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de SafeBuild")
+    parser.add_argument('--scenes', type=int, default=SWEEP_CONFIG['num_scenes'],
+                        help="Escenas sintéticas por configuración")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla del conjunto sintético")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                        help="Procesos en paralelo (1 = secuencial)")
+    parser.add_argument('--recall-target', type=float, default=SWEEP_CONFIG['recall_target'])
+    parser.add_argument('--precision-target', type=float,
+                        default=SWEEP_CONFIG['precision_target'])
+    parser.add_argument('--detector',
+                        help="Detector como 'modulo:funcion' con firma (muestra, params)")
+    parser.add_argument('--dataset',
+                        help="Conjunto etiquetado como 'modulo:funcion' sin argumentos que "
+                             "devuelve muestras {image, detections}; reemplaza al sintético")
+    parser.add_argument('--output', help="Guardar todos los resultados en un JSON")
+    args = parser.parse_args(argv)
+
+    if args.detector:
+        detector = _load_callable(args.detector)
+    else:
+        detector = simulated_detector
+        print("Aviso: con el detector simulado los fps y latencias no son significativos; "
+              "use --detector para medir un modelo real.\n")
+
+    if args.dataset:
+        dataset_factory = _load_callable(args.dataset)
+    else:
+        dataset_factory = partial(synthetic_dataset, seed=args.seed, count=args.scenes,
+                                  width=args.width, height=args.height)
+    results = run_sweep(dataset_factory, detector=detector, processes=args.processes)
+
+    print("Frontera de Pareto (recall y precisión de seguridad vs. fps):")
+    for result in pareto_frontier(results):
+        print("  " + _format_row(result))
+
+    selected = select_configuration(results, args.recall_target, args.precision_target)
+    targets = f"recall >= {args.recall_target}, precisión >= {args.precision_target}"
+    if selected:
+        print(f"\nConfiguración recomendada ({targets}):")
+        print("  " + _format_row(selected))
+    else:
+        print(f"\nNinguna configuración alcanza {targets}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(results, handle, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+Generador determinístico de escenas sintéticas
+Produce imágenes y detecciones de referencia (ground truth) reproducibles a
+partir de una semilla, para pruebas de carga y de regresión sin conexión
+"""
+
+import numpy as np
+
+# Colores RGB usados al renderizar las escenas
+_HELMET_COLORS = [(255, 220, 0), (255, 255, 255), (255, 140, 0)]
+_VEST_COLORS = [(255, 120, 0), (180, 255, 0)]
+_OCCLUDER_COLOR = (110, 110, 120)
+
+
+class SyntheticSceneGenerator:
+    """
+    Generador de escenas de obra sintéticas con ground truth
+
+    Cada trabajador produce una detección 'person' y, según los ratios de
+    cumplimiento, detecciones 'helmet' y 'safety_vest' con el mismo formato
+    que usa el sistema experto (class_name, confidence, bbox). La misma
+    semilla produce siempre la misma secuencia de escenas.
+    """
+
+    def __init__(self, seed=0, width=1280, height=720, workers=10,
+                 helmet_ratio=0.8, vest_ratio=0.8, occlusion=0.0, overlap=0.0,
+                 worker_height=(0.08, 0.25), max_speed=8.0, render=True):
+        """
+        Args:
+            seed (int): Semilla del generador aleatorio
+            width (int): Ancho de la imagen en píxeles
+            height (int): Alto de la imagen en píxeles
+            workers (int | tuple): Cantidad fija de trabajadores o rango (mín, máx)
+            helmet_ratio (float): Fracción de trabajadores con casco
+            vest_ratio (float): Fracción de trabajadores con chaleco
+            occlusion (float): Fracción de trabajadores parcialmente ocultos
+            overlap (float): Probabilidad de que un trabajador aparezca junto a otro
+            worker_height (tuple): Alto del trabajador como fracción del alto de la imagen
+            max_speed (float): Velocidad máxima en píxeles por frame (secuencias)
+            render (bool): Si es False sólo se generan las detecciones (sin imagen)
+        """
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.workers = workers
+        self.helmet_ratio = helmet_ratio
+        self.vest_ratio = vest_ratio
+        self.occlusion = occlusion
+        self.overlap = overlap
+        self.worker_height = worker_height
+        self.max_speed = max_speed
+        self.render = render
+        self._background = None
+
+    # =============================================
+    # API PÚBLICA
+    # =============================================
+    def scenes(self, count=None):
+        """
+        Generar escenas independientes (cada una con trabajadores nuevos)
+
+        Args:
+            count (int): Cantidad de escenas; None genera indefinidamente
+
+        Yields:
+            dict: Escena con image, detections, statistics y frame_index
+        """
+        # Generador nuevo en cada llamada: misma semilla, misma secuencia
+        rng = np.random.default_rng(self.seed)
+        index = 0
+        while count is None or index < count:
+            workers = self._spawn_workers(rng)
+            yield self._build_scene(index, workers)
+            index += 1
+
+    def sequence(self, num_frames=None):
+        """
+        Generar una secuencia de frames con los mismos trabajadores en movimiento
+
+        Args:
+            num_frames (int): Cantidad de frames; None genera indefinidamente
+
+        Yields:
+            dict: Frame con image, detections, statistics y frame_index
+        """
+        workers = self._spawn_workers(np.random.default_rng(self.seed))
+        index = 0
+        while num_frames is None or index < num_frames:
+            yield self._build_scene(index, workers)
+            self._move_workers(workers)
+            index += 1
+
+    # =============================================
+    # GENERACIÓN DE TRABAJADORES
+    # =============================================
+    def _worker_count(self, rng):
+        if isinstance(self.workers, (tuple, list)):
+            low, high = self.workers
+            return int(rng.integers(low, high + 1))
+        return int(self.workers)
+
+    def _spawn_workers(self, rng):
+        """Crear los trabajadores de una escena como arreglos de numpy"""
+        count = self._worker_count(rng)
+
+        heights = rng.uniform(*self.worker_height, size=count) * self.height
+        heights = np.maximum(heights, 8)
+        widths = np.maximum(heights * 0.4, 4)
+
+        xs = rng.uniform(0, 1, size=count) * np.maximum(self.width - widths, 1)
+        ys = rng.uniform(0, 1, size=count) * np.maximum(self.height - heights, 1)
+
+        # Agrupar trabajadores: algunos aparecen pegados a uno anterior
+        clustered = rng.random(count) < self.overlap
+        for i in np.flatnonzero(clustered):
+            if i == 0:
+                continue
+            anchor = int(rng.integers(0, i))
+            xs[i] = np.clip(xs[anchor] + rng.uniform(-0.5, 0.5) * widths[anchor],
+                            0, max(self.width - widths[i], 0))
+            ys[i] = np.clip(ys[anchor] + rng.uniform(-0.2, 0.2) * heights[anchor],
+                            0, max(self.height - heights[i], 0))
+
+        angles = rng.uniform(0, 2 * np.pi, size=count)
+        speeds = rng.uniform(0, self.max_speed, size=count)
+
+        return {
+            'x': xs,
+            'y': ys,
+            'w': widths,
+            'h': heights,
+            'vx': np.cos(angles) * speeds,
+            'vy': np.sin(angles) * speeds,
+            'helmet': rng.random(count) < self.helmet_ratio,
+            'vest': rng.random(count) < self.vest_ratio,
+            'occluded': rng.random(count) < self.occlusion,
+            'helmet_color': rng.integers(0, len(_HELMET_COLORS), size=count),
+            'vest_color': rng.integers(0, len(_VEST_COLORS), size=count),
+            'body_color': rng.integers(40, 200, size=(count, 3)),
+        }
+
+    def _move_workers(self, workers):
+        """Avanzar un frame: movimiento lineal con rebote en los bordes"""
+        for pos, vel, size, limit in (('x', 'vx', 'w', self.width),
+                                      ('y', 'vy', 'h', self.height)):
+            workers[pos] += workers[vel]
+            max_pos = np.maximum(limit - workers[size], 0)
+            out = (workers[pos] < 0) | (workers[pos] > max_pos)
+            workers[vel][out] *= -1
+            workers[pos] = np.clip(workers[pos], 0, max_pos)
+
+    # =============================================
+    # CONSTRUCCIÓN DE LA ESCENA
+    # =============================================
+    def _build_scene(self, index, workers):
+        detections = []
+        persons = helmets = vests = 0
+
+        for i in range(len(workers['x'])):
+            x1, y1 = float(workers['x'][i]), float(workers['y'][i])
+            w, h = float(workers['w'][i]), float(workers['h'][i])
+            occluded = bool(workers['occluded'][i])
+
+            detections.append({
+                'class_name': 'person', 'confidence': 1.0,
+                'bbox': [x1, y1, x1 + w, y1 + h],
+                'track_id': i, 'occluded': occluded
+            })
+            persons += 1
+
+            if workers['helmet'][i]:
+                detections.append({
+                    'class_name': 'helmet', 'confidence': 1.0,
+                    'bbox': self._clip_bbox(x1 + w * 0.25, y1 - h * 0.03,
+                                           x1 + w * 0.75, y1 + h * 0.12),
+                    'track_id': i, 'occluded': False
+                })
+                helmets += 1
+
+            if workers['vest'][i]:
+                detections.append({
+                    'class_name': 'safety_vest', 'confidence': 1.0,
+                    'bbox': [x1, y1 + h * 0.2, x1 + w, y1 + h * 0.5],
+                    'track_id': i, 'occluded': False
+                })
+                vests += 1
+
+        return {
+            'frame_index': index,
+            'image': self._render(workers) if self.render else None,
+            'detections': detections,
+            'statistics': {
+                'persons': persons,
+                'helmets': helmets,
+                'vests': vests
+            }
+        }
+
+    def _clip_bbox(self, x1, y1, x2, y2):
+        """Recortar una caja a los límites de la imagen"""
+        return [max(x1, 0.0), max(y1, 0.0),
+                min(x2, float(self.width)), min(y2, float(self.height))]
+
+    def _get_background(self):
+        """Fondo fijo con textura suave (se genera una sola vez por generador)"""
+        if self._background is None:
+            rows = np.linspace(170, 120, self.height, dtype=np.float32)[:, None]
+            cols = np.linspace(0, 20, self.width, dtype=np.float32)[None, :]
+            base = rows + cols
+            # Generador propio para que renderizar o no, no altere la secuencia de trabajadores
+            noise_rng = np.random.default_rng((self.seed, 1))
+            noise = noise_rng.normal(0, 2, size=(self.height, self.width)).astype(np.float32)
+            gray = np.clip(base + noise, 0, 255).astype(np.uint8)
+            self._background = np.repeat(gray[:, :, None], 3, axis=2)
+        return self._background
+
+    def _render(self, workers):
+        """Dibujar los trabajadores como rectángulos sobre el fondo"""
+        image = self._get_background().copy()
+
+        def fill(x1, y1, x2, y2, color):
+            x1, y1 = max(int(x1), 0), max(int(y1), 0)
+            x2, y2 = min(int(x2), self.width), min(int(y2), self.height)
+            if x2 > x1 and y2 > y1:
+                image[y1:y2, x1:x2] = color
+
+        for i in range(len(workers['x'])):
+            x1, y1 = workers['x'][i], workers['y'][i]
+            w, h = workers['w'][i], workers['h'][i]
+
+            fill(x1, y1, x1 + w, y1 + h, workers['body_color'][i])
+            if workers['helmet'][i]:
+                fill(x1 + w * 0.25, y1 - h * 0.03, x1 + w * 0.75, y1 + h * 0.12,
+                     _HELMET_COLORS[workers['helmet_color'][i]])
+            if workers['vest'][i]:
+                fill(x1, y1 + h * 0.2, x1 + w, y1 + h * 0.5,
+                     _VEST_COLORS[workers['vest_color'][i]])
+            if workers['occluded'][i]:
+                # Obstáculo (material, maquinaria) tapando la parte inferior
+                fill(x1 - w * 0.2, y1 + h * 0.55, x1 + w * 1.2, y1 + h, _OCCLUDER_COLOR)
+
+        return image
@@ -0,0 +1,414 @@
+"""
+Inferencia por teselas para imágenes de muy alta resolución
+Recorre la imagen en teselas solapadas, las procesa por lotes y fusiona
+las detecciones en coordenadas globales
+"""
+
+import numpy as np
+
+from .config import MODEL_CONFIG, TILING_CONFIG
+
+
+def tile_positions(length, tile_size, overlap):
+    """
+    Calcular las posiciones de inicio de las teselas a lo largo de un eje
+
+    Args:
+        length (int): Longitud del eje en píxeles
+        tile_size (int): Lado de la tesela
+        overlap (float): Fracción de solapamiento entre teselas (0 <= overlap < 1)
+
+    Returns:
+        list: Posiciones de inicio; la última tesela queda alineada al borde
+    """
+    if length <= tile_size:
+        return [0]
+
+    stride = max(1, int(tile_size * (1 - overlap)))
+    positions = list(range(0, length - tile_size, stride))
+    positions.append(length - tile_size)
+    return positions
+
+
+def iter_tiles(image, tile_size=None, overlap=None):
+    """
+    Generador de teselas solapadas sobre la imagen
+
+    Las teselas son vistas de numpy sobre la imagen original (no se copian),
+    por lo que el consumo de memoria no crece con el número de teselas.
+
+    Args:
+        image (np.ndarray): Imagen HxW o HxWxC
+        tile_size (int): Lado de la tesela (por defecto TILING_CONFIG)
+        overlap (float): Solapamiento entre teselas (por defecto TILING_CONFIG)
+
+    Yields:
+        tuple: (x_offset, y_offset, tesela)
+    """
+    tile_size = tile_size or TILING_CONFIG['tile_size']
+    overlap = TILING_CONFIG['overlap'] if overlap is None else overlap
+    height, width = image.shape[:2]
+
+    for y in tile_positions(height, tile_size, overlap):
+        for x in tile_positions(width, tile_size, overlap):
+            yield x, y, image[y:y + tile_size, x:x + tile_size]
+
+
+def _subsample(tile, stride):
+    """
+    Submuestrear la tesela (float32, HxWxC) para los chequeos rápidos
+
+    Se conservan los canales: un chaleco verde sobre una losa gris de igual
+    brillo no tiene contraste en escala de grises, pero sí en color.
+    """
+    small = tile[::stride, ::stride].astype(np.float32)
+    if small.ndim == 2:
+        small = small[:, :, None]
+    return small
+
+
+def is_empty_tile(tile, previous_tile=None, saliency_threshold=None,
+                  motion_threshold=None, stride=None):
+    """
+    Chequeo barato para descartar teselas sin contenido relevante
+
+    Una tesela se considera vacía cuando ninguna de sus celdas tiene contraste
+    local en ningún canal (cielo, losas, paredes lisas) y, si se dispone del
+    frame anterior, tampoco hubo movimiento en esa región.
+
+    Args:
+        tile (np.ndarray): Tesela a evaluar
+        previous_tile (np.ndarray): Misma región del frame anterior (opcional)
+        saliency_threshold (float): Desvío estándar mínimo por celda y canal
+        motion_threshold (float): Diferencia media mínima (por canal) con el frame anterior
+        stride (int): Submuestreo aplicado antes del chequeo
+
+    Returns:
+        bool: True si la tesela puede omitirse
+    """
+    if saliency_threshold is None:
+        saliency_threshold = TILING_CONFIG['saliency_threshold']
+    if motion_threshold is None:
+        motion_threshold = TILING_CONFIG['motion_threshold']
+    stride = stride or TILING_CONFIG['saliency_stride']
+
+    small = _subsample(tile, stride)
+    if small.shape[0] < 2 or small.shape[1] < 2:
+        return False
+
+    if float(_cells(small).std(axis=(1, 3)).max()) >= saliency_threshold:
+        return False
+
+    if previous_tile is not None:
+        motion = np.abs(small - _subsample(previous_tile, stride))
+        if float(_cells(motion).mean(axis=(1, 3)).max()) >= motion_threshold:
+            return False
+
+    return True
+
+
+def _cells(values, cells=8):
+    """
+    Reordenar un arreglo HxWxC en una grilla de celdas (filas, alto, columnas, ancho, C)
+
+    Los chequeos se evalúan por celda y se toma el máximo, para que un
+    trabajador lejano (pocos píxeles) no quede diluido en una tesela lisa.
+    """
+    cell_h = max(1, values.shape[0] // cells)
+    cell_w = max(1, values.shape[1] // cells)
+    rows = values.shape[0] // cell_h
+    cols = values.shape[1] // cell_w
+    return values[:rows * cell_h, :cols * cell_w].reshape(rows, cell_h, cols, cell_w,
+                                                          *values.shape[2:])
+
+
+def _box_overlap(box, boxes, metric):
+    """Solapamiento entre una caja y un arreglo de cajas, o entre pares de cajas (IoU o IoS)"""
+    x1 = np.maximum(box[..., 0], boxes[:, 0])
+    y1 = np.maximum(box[..., 1], boxes[:, 1])
+    x2 = np.minimum(box[..., 2], boxes[:, 2])
+    y2 = np.minimum(box[..., 3], boxes[:, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area = (box[..., 2] - box[..., 0]) * (box[..., 3] - box[..., 1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    if metric == 'ios':
+        denominator = np.minimum(area, areas)
+    else:
+        denominator = area + areas - intersection
+    return intersection / np.maximum(denominator, 1e-9)
+
+
+def non_max_suppression(detections, iou_threshold=None, metric='iou'):
+    """
+    Supresión de no-máximos por clase
+
+    Args:
+        detections (list): Detecciones con class_name, confidence, bbox
+        iou_threshold (float): Umbral de solapamiento (por defecto MODEL_CONFIG)
+        metric (str): 'iou' o 'ios' (intersección sobre la caja menor, útil para
+            fusionar cajas recortadas en los bordes de las teselas)
+
+    Returns:
+        list: Detecciones conservadas, ordenadas por confianza descendente
+    """
+    if iou_threshold is None:
+        iou_threshold = MODEL_CONFIG['iou_threshold']
+
+    by_class = {}
+    for det in detections:
+        by_class.setdefault(det['class_name'], []).append(det)
+
+    kept = []
+    for class_detections in by_class.values():
+        class_detections.sort(key=lambda det: det['confidence'], reverse=True)
+        boxes = np.array([det['bbox'] for det in class_detections], dtype=np.float32)
+        remaining = np.arange(len(class_detections))
+
+        while remaining.size:
+            best = remaining[0]
+            kept.append(class_detections[best])
+            rest = remaining[1:]
+            if not rest.size:
+                break
+            overlap = _box_overlap(boxes[best], boxes[rest], metric)
+            remaining = rest[overlap < iou_threshold]
+
+    kept.sort(key=lambda det: det['confidence'], reverse=True)
+    return kept
+
+
+def _batched(iterable, batch_size):
+    """Agrupar un iterable en listas de como máximo batch_size elementos"""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _neighbour_overlaps(positions, tile_size, length):
+    """
+    Solapamiento real de cada tesela con sus vecinas a lo largo de un eje
+
+    La última tesela se alinea al borde de la imagen, así que su solapamiento
+    con la anterior suele ser mayor que tile_size * overlap.
+
+    Returns:
+        dict: posición -> (solapamiento con la anterior, con la siguiente);
+            0 donde no hay vecina (borde de la imagen)
+    """
+    overlaps = {}
+    for index, position in enumerate(positions):
+        end = min(position + tile_size, length)
+        before = after = 0
+        if index > 0:
+            before = min(positions[index - 1] + tile_size, length) - position
+        if index + 1 < len(positions):
+            after = end - positions[index + 1]
+        overlaps[position] = (max(before, 0), max(after, 0))
+    return overlaps
+
+
+def _seam_info(bbox, rect, bands, margin=2):
+    """
+    Clasificar una caja respecto de los bordes internos de su tesela
+
+    Args:
+        bbox (list): Caja en coordenadas globales
+        rect (tuple): Rectángulo de la tesela (x1, y1, x2, y2)
+        bands (tuple): Solapamiento con la vecina izquierda, superior, derecha
+            e inferior (0 en los bordes de la imagen)
+        margin (int): Distancia al borde por debajo de la cual la caja está cortada
+
+    Returns:
+        tuple: (truncated, in_band) - truncated si la caja toca un borde interno
+            de la tesela (objeto cortado); in_band si cae en la franja de
+            solapamiento con una tesela vecina
+    """
+    x1, y1, x2, y2 = bbox
+    distances = (x1 - rect[0], y1 - rect[1], rect[2] - x2, rect[3] - y2)
+    # Los bordes de la imagen (sin vecina) no cuentan
+    sides = [(distance, band) for distance, band in zip(distances, bands) if band > 0]
+
+    truncated = any(distance <= margin for distance, _ in sides)
+    in_band = any(distance <= band for distance, band in sides)
+    return truncated, in_band
+
+
+def _clip_boxes(boxes, regions):
+    """Recortar cajas (N, 4) a regiones (N, 4) o a una sola región"""
+    return np.concatenate([np.maximum(boxes[:, :2], regions[..., :2]),
+                           np.minimum(boxes[:, 2:], regions[..., 2:])], axis=1)
+
+
+def _merge_tile_seams(entries, threshold, metric):
+    """
+    Fusionar duplicados entre teselas vecinas
+
+    Sólo se comparan pares de teselas distintas en los que ambas cajas están
+    junto a una costura (cortadas o dentro de la franja de solapamiento). Cada
+    caja se recorta a la tesela de la otra antes de medir el solapamiento: es
+    lo que la otra tesela ve del mismo objeto, así la mitad cortada de un
+    trabajador coincide con la caja completa vista por la tesela vecina.
+
+    Los pares se agrupan de mayor a menor solapamiento y un grupo nunca tiene
+    dos cajas de la misma tesela, de modo que cada fragmento queda con su
+    mejor pareja y no con la de un trabajador vecino. De cada grupo se
+    conserva la caja completa de mayor confianza o, si todas están cortadas,
+    su unión. Las cajas sin pareja se devuelven sin cambios.
+
+    Args:
+        entries (list): Tuplas (detección, rectángulo_de_tesela, truncated)
+        threshold (float): Umbral de solapamiento
+        metric (str): 'iou' o 'ios'
+
+    Returns:
+        list: Detecciones resultantes
+    """
+    if not entries:
+        return []
+    boxes = np.array([det['bbox'] for det, _, _ in entries], dtype=np.float32)
+    rects = np.array([rect for _, rect, _ in entries], dtype=np.float32)
+    classes = np.array([det['class_name'] for det, _, _ in entries])
+
+    pairs = []
+    for i in range(len(entries) - 1):
+        others = np.arange(i + 1, len(entries))
+        others = others[(classes[others] == classes[i]) &
+                        np.any(rects[others] != rects[i], axis=1)]
+        if not others.size:
+            continue
+        seen_by_others = _clip_boxes(boxes[i][None, :].repeat(others.size, axis=0), rects[others])
+        seen_by_tile = _clip_boxes(boxes[others], rects[i])
+        valid = ((seen_by_others[:, 2] > seen_by_others[:, 0]) &
+                 (seen_by_others[:, 3] > seen_by_others[:, 1]))
+        overlap = _box_overlap(seen_by_others, seen_by_tile, metric)
+        for j, value in zip(others[valid], overlap[valid]):
+            if value >= threshold:
+                pairs.append((value, i, j))
+
+    # Agrupar de mayor a menor solapamiento, sin repetir tesela en un grupo
+    groups = {index: [index] for index in range(len(entries))}
+    group_of = list(range(len(entries)))
+    group_tiles = {index: {tuple(rects[index])} for index in range(len(entries))}
+    for _, i, j in sorted(pairs, key=lambda pair: pair[0], reverse=True):
+        group, other = group_of[i], group_of[j]
+        if group == other or group_tiles[group] & group_tiles[other]:
+            continue
+        for index in groups[other]:
+            group_of[index] = group
+        groups[group] += groups.pop(other)
+        group_tiles[group] |= group_tiles.pop(other)
+
+    merged = []
+    for members in groups.values():
+        members = sorted(members, key=lambda index: entries[index][0]['confidence'],
+                         reverse=True)
+        complete = [index for index in members if not entries[index][2]]
+        if complete:
+            merged.append(entries[complete[0]][0])
+            continue
+        union = boxes[members]
+        merged.append({**entries[members[0]][0],
+                       'bbox': [float(union[:, 0].min()), float(union[:, 1].min()),
+                                float(union[:, 2].max()), float(union[:, 3].max())]})
+    return merged
+
+
+def tiled_inference(image, detect_batch, previous_image=None, tile_size=None,
+                    overlap=None, batch_size=None, skip_empty=True,
+                    confidence_threshold=None, iou_threshold=None):
+    """
+    Ejecutar el detector sobre una imagen grande por teselas
+
+    El detector recibe lotes de teselas y devuelve, para cada una, su lista de
+    detecciones en coordenadas locales. Sólo se mantiene en memoria un lote de
+    teselas a la vez (vistas sobre la imagen) más las detecciones acumuladas.
+
+    Args:
+        image (np.ndarray): Imagen completa
+        detect_batch (callable): Función lista_de_teselas -> lista_de_detecciones_por_tesela
+        previous_image (np.ndarray): Frame anterior para el chequeo de movimiento
+            (opcional; se ignora si su tamaño no coincide con el de la imagen)
+        tile_size (int): Lado de la tesela
+        overlap (float): Solapamiento entre teselas
+        batch_size (int): Teselas por lote
+        skip_empty (bool): Omitir teselas marcadas como vacías
+        confidence_threshold (float): Confianza mínima (por defecto MODEL_CONFIG)
+        iou_threshold (float): Umbral de NMS y de fusión en costuras (por defecto MODEL_CONFIG)
+
+    Returns:
+        dict: Detecciones globales y estadísticas del recorrido
+    """
+    tile_size = tile_size or TILING_CONFIG['tile_size']
+    overlap = TILING_CONFIG['overlap'] if overlap is None else overlap
+    batch_size = batch_size or TILING_CONFIG['batch_size']
+    if confidence_threshold is None:
+        confidence_threshold = MODEL_CONFIG['confidence_threshold']
+    if iou_threshold is None:
+        iou_threshold = MODEL_CONFIG['iou_threshold']
+    if previous_image is not None and previous_image.shape != image.shape:
+        # Cambio de resolución de la cámara: no hay referencia para el movimiento
+        previous_image = None
+
+    image_h, image_w = image.shape[:2]
+    x_overlaps = _neighbour_overlaps(tile_positions(image_w, tile_size, overlap), tile_size, image_w)
+    y_overlaps = _neighbour_overlaps(tile_positions(image_h, tile_size, overlap), tile_size, image_h)
+    tile_stats = {'total': 0, 'skipped': 0, 'processed': 0}
+
+    def candidate_tiles():
+        for x, y, tile in iter_tiles(image, tile_size, overlap):
+            tile_stats['total'] += 1
+            if skip_empty:
+                previous_tile = None
+                if previous_image is not None:
+                    previous_tile = previous_image[y:y + tile.shape[0], x:x + tile.shape[1]]
+                if is_empty_tile(tile, previous_tile):
+                    tile_stats['skipped'] += 1
+                    continue
+            yield x, y, tile
+
+    detections = []
+    seam_entries = []
+    for batch in _batched(candidate_tiles(), batch_size):
+        results = detect_batch([tile for _, _, tile in batch])
+        tile_stats['processed'] += len(batch)
+
+        for (x, y, tile), tile_detections in zip(batch, results):
+            tile_h, tile_w = tile.shape[:2]
+            rect = (x, y, x + tile_w, y + tile_h)
+            (left, right), (top, bottom) = x_overlaps[x], y_overlaps[y]
+            for det in tile_detections:
+                if det['confidence'] < confidence_threshold:
+                    continue
+                x1, y1, x2, y2 = det['bbox']
+                global_det = {**det, 'bbox': [x1 + x, y1 + y, x2 + x, y2 + y]}
+                truncated, in_band = _seam_info(global_det['bbox'], rect,
+                                                (left, top, right, bottom))
+                if truncated or in_band:
+                    seam_entries.append((global_det, rect, truncated))
+                else:
+                    detections.append(global_det)
+
+    # 1) Fusión en costuras antes de la NMS: cada fragmento cortado se absorbe
+    #    en la caja completa de la tesela vecina, así no puede suprimirla ni
+    #    sobrevivir cuando la NMS descarta a su trabajador
+    detections += _merge_tile_seams(seam_entries, iou_threshold, TILING_CONFIG['merge_metric'])
+
+    # 2) NMS por IoU sobre todo: duplicados del detector, como en la imagen completa
+    detections = non_max_suppression(detections, iou_threshold)
+
+    return {
+        'detections': detections,
+        'tiles': tile_stats
+    }
+
+
+def should_tile(image, min_image_side=None):
+    """Indicar si la imagen es lo bastante grande como para procesarla por teselas"""
+    min_image_side = min_image_side or TILING_CONFIG['min_image_side']
+    return max(image.shape[:2]) >= min_image_side
@@ -0,0 +1,69 @@
+"""
+Visualización de resultados de SafeBuild
+Dibuja las detecciones y el panel del análisis sobre la imagen
+"""
+
+import cv2
+
+
+def draw_detections_on_image(image, detections, analysis):
+    """
+    Dibujar bounding boxes y información en la imagen
+    Returns: imagen con anotaciones
+    """
+    img_copy = image.copy()
+    
+    # Colores para cada clase
+    colors = {
+        'person': (0, 255, 0),      # Verde - Trabajadores
+        'helmet': (255, 0, 0),      # Azul - Cascos
+        'safety_vest': (0, 0, 255)  # Rojo - Chalecos
+    }
+    
+    # Dibujar cada detección
+    for detection in detections:
+        class_name = detection['class_name']
+        confidence = detection['confidence']
+        x1, y1, x2, y2 = map(int, detection['bbox'])
+        color = colors.get(class_name, (255, 255, 255))
+        
+        # Dibujar bounding box
+        cv2.rectangle(img_copy, (x1, y1), (x2, y2), color, 3)
+        
+        # Etiqueta con clase y confianza
+        label = f"{class_name} ({confidence:.2f})"
+        label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)[0]
+        
+        # Fondo para la etiqueta
+        cv2.rectangle(img_copy, (x1, y1 - label_size[1] - 10), 
+                     (x1 + label_size[0], y1), color, -1)
+        # Texto de la etiqueta
+        cv2.putText(img_copy, label, (x1, y1 - 5), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    
+    # Añadir panel de información del análisis
+    alert_level = analysis['alert_level']
+    alert_color = {
+        'ALTA': (0, 0, 255),    # Rojo
+        'MEDIA': (0, 165, 255), # Naranja
+        'OK': (0, 255, 0)       # Verde
+    }.get(alert_level, (255, 255, 255))
+    
+    # Panel semi-transparente
+    overlay = img_copy.copy()
+    cv2.rectangle(overlay, (10, 10), (500, 130), (0, 0, 0), -1)
+    cv2.addWeighted(overlay, 0.7, img_copy, 0.3, 0, img_copy)
+    
+    # Texto del análisis
+    cv2.putText(img_copy, f"ESTADO: {alert_level}", (20, 40),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.8, alert_color, 2)
+    cv2.putText(img_copy, analysis['alert_message'], (20, 70),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    
+    # Estadísticas
+    stats = analysis.get('statistics', {})
+    stats_text = f"Trabajadores: {stats.get('persons', 0)} | Cascos: {stats.get('helmets', 0)} | Chalecos: {stats.get('vests', 0)}"
+    cv2.putText(img_copy, stats_text, (20, 100),
+               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    
+    return img_copy